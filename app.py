@@ -1,6 +1,7 @@
 import streamlit as st
 from pathlib import Path
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import time
@@ -12,8 +13,8 @@ from streamlit_lottie import st_lottie
 # Backend imports
 from src.data_loader import load_raw_data
 from src.preprocessing import clean_price_data, simplify_grades, encode_categorical_features, remove_outliers
-from src.model import split_data, train_model, evaluate_model, get_feature_importance, calculate_advanced_metrics
-from src.scraper import scrape_listings
+from src.model import split_data, train_model, evaluate_model, get_feature_importance, calculate_advanced_metrics, predict_price
+from src.scraper import scrape_listings, html_cache_requested, LISTING_DTYPES
 
 # --- [CONFIG & ASSETS] ---
 st.set_page_config(
@@ -147,11 +148,106 @@ def get_car_name_from_df(df):
     except:
         return "UNKNOWN ASSET"
 
+# --- [CACHED BACKEND CALLS] ---
+# Streamlit reruns the whole script on every widget interaction.
+# Keys are hashable snapshots (file mtime, frame contents) so a new scrape
+# or retrain always invalidates them.
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_session_csv(path_str: str, mtime: float):
+    return pd.read_csv(path_str)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_clean(df):
+    return clean_price_data(df)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def market_kpis(df):
+    """
+    Tab 1 aggregates, computed once per dataset instead of on every rerun.
+    """
+    # Both quartiles and means from one float array, no per-column pandas passes
+    arr = df[['price', 'mileage']].to_numpy(np.float64, na_value=np.nan)
+    # Columns with no finite values stay NaN instead of raising NumPy's
+    # empty/all-NaN slice warnings into the log
+    has_data = np.isfinite(arr).any(axis=0)
+    quartiles = np.full(2, np.nan)
+    means = np.full(2, np.nan)
+    if has_data.any():
+        quartiles[has_data] = np.nanquantile(arr[:, has_data], 0.25, axis=0)
+        means[has_data] = np.nanmean(arr[:, has_data], axis=0)
+    q_price, q_mileage = quartiles
+    avg_price, avg_mileage = means
+    unicorns = int(((arr[:, 0] < q_price) & (arr[:, 1] < q_mileage)).sum())
+    return {
+        'avg_price': avg_price,
+        'avg_mileage': avg_mileage,
+        'unicorns': unicorns,
+        'trans_counts': df['transmission'].value_counts(),
+    }
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def market_figures(df):
+    """
+    Builds the Tab 1 charts once per dataset. The OLS trendline refits a
+    statsmodels regression, so redrawing it on every rerun is wasteful.
+    """
+    try:
+        fig = px.scatter(
+            df, x="mileage", y="price", color="year",
+            hover_data=['grade', 'transmission'],
+            trendline="ols", trendline_color_override="#FF00FF",
+            title="VALUATION MATRIX: PRICE ('000 JPY) vs MILEAGE",
+            color_continuous_scale="Viridis", template="plotly_dark"
+        )
+    except:
+        fig = px.scatter(
+            df, x="mileage", y="price", color="year",
+            title="VALUATION MATRIX: PRICE ('000 JPY) vs MILEAGE (Insufficient data for Trendline)",
+            color_continuous_scale="Viridis", template="plotly_dark"
+        )
+
+    fig.update_traces(marker=dict(size=10, line=dict(width=1, color='white'), opacity=0.8))
+    fig.update_layout(paper_bgcolor="#0e1117", plot_bgcolor="#0e1117", font=dict(family="Courier New, monospace", color="#e0e0e0"))
+
+    fig2 = px.histogram(df, x="price", nbins=20, title="PRICE DISTRIBUTION", template="plotly_dark", color_discrete_sequence=['#00FFFF'])
+    fig2.update_layout(paper_bgcolor="#0e1117", plot_bgcolor="#0e1117")
+
+    trans_counts = market_kpis(df)['trans_counts']
+    fig3 = px.pie(names=trans_counts.index, values=trans_counts.values, title="TRANSMISSION RATIO", template="plotly_dark", hole=0.4, color_discrete_sequence=['#FF00FF', '#00FFFF'])
+    fig3.update_layout(paper_bgcolor="#0e1117")
+    return fig, fig2, fig3
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def training_figures(imp_df, residuals):
+    """
+    Builds the Tab 2 charts once per trained model.
+    """
+    fig_imp = px.bar(
+        imp_df.head(10), x="Importance", y="Feature", orientation='h', 
+        title="NEURAL WEIGHTS (Which specs drive price?)", template="plotly_dark", 
+        color="Importance", color_continuous_scale="Bluered"
+    )
+    fig_imp.update_layout(
+        yaxis={'categoryorder':'total ascending'}, paper_bgcolor="#0e1117", plot_bgcolor="#0e1117",
+        font=dict(family="Courier New, monospace", color="#e0e0e0")
+    )
+
+    fig_res = px.histogram(
+        residuals, nbins=30, title="ERROR DISTRIBUTION (Residuals)",
+        template="plotly_dark", color_discrete_sequence=['#FF00FF']
+    )
+    fig_res.update_layout(paper_bgcolor="#0e1117", plot_bgcolor="#0e1117", showlegend=False)
+    return fig_imp, fig_res
+
+@st.cache_resource(ttl=3600, max_entries=4, show_spinner=False)
+def cached_train(X_train, y_train):
+    return train_model(X_train, y_train)
+
 # --- [SESSION PERSISTENCE LOGIC] ---
 if 'buffer_df' not in st.session_state:
     if SESSION_FILE.exists():
         try:
-            st.session_state.buffer_df = pd.read_csv(SESSION_FILE)
+            st.session_state.buffer_df = load_session_csv(str(SESSION_FILE), SESSION_FILE.stat().st_mtime)
             st.session_state.buffer_logs = ["✅ Session Restored from Cache."]
             # Auto-detect name from loaded file
             st.session_state.target_name = get_car_name_from_df(st.session_state.buffer_df)
@@ -232,10 +328,19 @@ if ignite_btn:
                 status_text.code(f"scannning_node_buffer: [{current}/{total}] packets received")
 
             # SCRAPE
-            data, logs = scrape_listings(target_url, max_pages=scan_depth, progress_callback=update_progress)
+            # Live by default; JDM_HTML_CACHE=1 reuses recently fetched pages (dev re-runs)
+            data, logs = scrape_listings(
+                target_url, max_pages=scan_depth, progress_callback=update_progress,
+                use_cache=html_cache_requested()
+            )
             
-            if data:
-                df = pd.DataFrame(data)
+            if len(data['price']) > 0:
+                # Scraper returns columns, not rows: numeric columns get their
+                # final dtype up front instead of pandas inferring it
+                df = pd.DataFrame({
+                    col: np.asarray(values, dtype=LISTING_DTYPES[col]) if col in LISTING_DTYPES else values
+                    for col, values in data.items()
+                }, copy=False)
                 st.session_state.buffer_df = df
                 st.session_state.buffer_logs = logs
                 
@@ -265,8 +370,7 @@ if st.session_state.buffer_df is None:
     st.info("⚠️ Awaiting Mission Parameters. Select a car and click Initialize Scan.")
     st.stop()
 
-df = st.session_state.buffer_df
-df = clean_price_data(df)
+df = cached_clean(st.session_state.buffer_df)
 
 # --- [CONTEXT BAR (Global HUD)] ---
 st.markdown(f"""
@@ -284,51 +388,31 @@ tab_market, tab_ai, tab_oracle = st.tabs(["📊 MARKET TELEMETRY", "🧠 NEURAL
 
 # === TAB 1: MARKET TELEMETRY ===
 with tab_market:
+    kpis = market_kpis(df)
     kpi1, kpi2, kpi3, kpi4 = st.columns(4)
     kpi1.metric("ASSETS TRACKED", len(df))
     
-    # FORMATTING FIX: Multiply by 1000 to show full JPY
-    avg_price = int(df['price'].mean() * 1000)
-    kpi2.metric("AVG VALUATION", f"{avg_price:,} JPY")
+    # FORMATTING FIX: Multiply by 1000 to show full JPY (NaN = no data in the column)
+    avg_price = kpis['avg_price']
+    kpi2.metric("AVG VALUATION", f"{int(avg_price * 1000):,} JPY" if np.isfinite(avg_price) else "—")
     
-    kpi3.metric("AVG MILEAGE", f"{int(df['mileage'].mean()):,} km")
+    avg_mileage = kpis['avg_mileage']
+    kpi3.metric("AVG MILEAGE", f"{int(avg_mileage):,} km" if np.isfinite(avg_mileage) else "—")
     
-    unicorns = len(df[(df['price'] < df['price'].quantile(0.25)) & (df['mileage'] < df['mileage'].quantile(0.25))])
-    kpi4.metric("POTENTIAL DEALS", unicorns, delta="High ROI")
+    kpi4.metric("POTENTIAL DEALS", kpis['unicorns'], delta="High ROI")
 
     st.markdown("### 📈 DEPRECIATION VECTORS")
     
     # Note: We display raw price ('000 JPY) in charts to keep axis clean, 
     # but the metrics above now show full price.
-    try:
-        fig = px.scatter(
-            df, x="mileage", y="price", color="year",
-            hover_data=['grade', 'transmission'],
-            trendline="ols", trendline_color_override="#FF00FF",
-            title="VALUATION MATRIX: PRICE ('000 JPY) vs MILEAGE",
-            color_continuous_scale="Viridis", template="plotly_dark"
-        )
-    except:
-        fig = px.scatter(
-            df, x="mileage", y="price", color="year",
-            title="VALUATION MATRIX: PRICE ('000 JPY) vs MILEAGE (Insufficient data for Trendline)",
-            color_continuous_scale="Viridis", template="plotly_dark"
-        )
-
-    fig.update_traces(marker=dict(size=10, line=dict(width=1, color='white'), opacity=0.8))
-    fig.update_layout(paper_bgcolor="#0e1117", plot_bgcolor="#0e1117", font=dict(family="Courier New, monospace", color="#e0e0e0"))
+    fig, fig2, fig3 = market_figures(df)
     st.plotly_chart(fig, use_container_width=True)
 
     c_chart1, c_chart2 = st.columns(2)
     with c_chart1:
-        fig2 = px.histogram(df, x="price", nbins=20, title="PRICE DISTRIBUTION", template="plotly_dark", color_discrete_sequence=['#00FFFF'])
-        fig2.update_layout(paper_bgcolor="#0e1117", plot_bgcolor="#0e1117")
         st.plotly_chart(fig2, use_container_width=True)
     
     with c_chart2:
-        trans_counts = df['transmission'].value_counts()
-        fig3 = px.pie(names=trans_counts.index, values=trans_counts.values, title="TRANSMISSION RATIO", template="plotly_dark", hole=0.4, color_discrete_sequence=['#FF00FF', '#00FFFF'])
-        fig3.update_layout(paper_bgcolor="#0e1117")
         st.plotly_chart(fig3, use_container_width=True)
 
     with st.expander("📂 RAW DATA_LOGS", expanded=False):
@@ -351,18 +435,16 @@ with tab_ai:
                 st.write("🔹 Engineering Grade Features & Encoding...")
                 time.sleep(0.8)
                 df_eng = simplify_grades(df_clean)
+                # Also drops link/mark/model metadata before encoding
                 df_enc = encode_categorical_features(df_eng)
                 
-                cols_to_drop = ['link', 'mark', 'model', 'Unnamed: 0']
-                df_enc = df_enc.drop(columns=[c for c in cols_to_drop if c in df_enc.columns], errors='ignore')
-                
                 st.write("🔹 Splitting Vector Space (80/20)...")
                 time.sleep(0.6)
                 X_train, X_test, y_train, y_test = split_data(df_enc)
                 
-                st.write("⚡ Optimizing XGBoost Hyperparameters (Grid Search)...")
+                st.write("⚡ Optimizing XGBoost Hyperparameters (Randomized Search)...")
                 # Warning: This step is resource intensive and may cause reload on low-memory envs
-                model = train_model(X_train, y_train)
+                model = cached_train(X_train, y_train)
                 
                 st.write("🔹 Running Diagnostics & Calculating Overfit Risk...")
                 metrics, preds = evaluate_model(model, X_test, y_test)
@@ -372,6 +454,7 @@ with tab_ai:
                     'model': model,
                     'metrics': metrics,
                     'adv_metrics': adv_metrics,
+                    'importance': get_feature_importance(model, X_train.columns),
                     'cols': X_train.columns
                 }
                 
@@ -388,7 +471,11 @@ with tab_ai:
         overfit_gap = (adv['train_r2'] - met['r2']) * 100
         overfit_color = "normal" if overfit_gap < 10 else "inverse"
         
-        imp_df = get_feature_importance(data_model['model'], data_model['cols'])
+        # Computed once at training time; older cached cores lack the key
+        imp_df = data_model.get('importance')
+        if imp_df is None:
+            imp_df = get_feature_importance(data_model['model'], data_model['cols'])
+            data_model['importance'] = imp_df
         if not imp_df.empty:
             top_feature = imp_df.iloc[0]['Feature']
             top_importance = imp_df.iloc[0]['Importance']
@@ -416,26 +503,12 @@ with tab_ai:
 
         st.markdown("---")
         
+        fig_imp, fig_res = training_figures(imp_df, adv['residuals'])
         c_plots1, c_plots2 = st.columns([2, 1])
         with c_plots1:
-            fig_imp = px.bar(
-                imp_df.head(10), x="Importance", y="Feature", orientation='h', 
-                title="NEURAL WEIGHTS (Which specs drive price?)", template="plotly_dark", 
-                color="Importance", color_continuous_scale="Bluered"
-            )
-            fig_imp.update_layout(
-                yaxis={'categoryorder':'total ascending'}, paper_bgcolor="#0e1117", plot_bgcolor="#0e1117",
-                font=dict(family="Courier New, monospace", color="#e0e0e0")
-            )
             st.plotly_chart(fig_imp, use_container_width=True)
             
         with c_plots2:
-            residuals = adv['residuals']
-            fig_res = px.histogram(
-                residuals, nbins=30, title="ERROR DISTRIBUTION (Residuals)",
-                template="plotly_dark", color_discrete_sequence=['#FF00FF']
-            )
-            fig_res.update_layout(paper_bgcolor="#0e1117", plot_bgcolor="#0e1117", showlegend=False)
             st.plotly_chart(fig_res, use_container_width=True)
 
 # === TAB 3: THE ORACLE ===
@@ -456,25 +529,21 @@ with tab_oracle:
             in_drive = st.radio("Drivetrain", ["2WD", "4WD"])
 
         if st.button("🔮 GENERATE PREDICTION"):
-            input_dict = {
-                'year': [in_year],
-                'mileage': [in_mileage],
-                'engine_capacity': [in_engine],
-                'transmission': ['mt' if "MT" in in_trans else 'at'],
-                'drive': ['4wd' if "4WD" in in_drive else '2wd'],
-                'grade_category': [in_grade],
-                'fuel': ['gasoline'],
-                'hand_drive': ['rhd']
+            specs = {
+                'year': in_year,
+                'mileage': in_mileage,
+                'engine_capacity': in_engine,
+                'transmission': 'mt' if "MT" in in_trans else 'at',
+                'drive': '4wd' if "4WD" in in_drive else '2wd',
+                'grade_category': in_grade,
+                'fuel': 'gasoline',
+                'hand_drive': 'rhd'
             }
             
-            input_df = pd.DataFrame(input_dict)
-            input_enc = pd.get_dummies(input_df)
-            
             model_cols = st.session_state.buffer_model['cols']
-            final_input = input_enc.reindex(columns=model_cols, fill_value=0)
             
             # Predict (Result is in '000 JPY)
-            pred_thousands = st.session_state.buffer_model['model'].predict(final_input)[0]
+            pred_thousands = predict_price(st.session_state.buffer_model['model'], model_cols, specs)
             
             # Convert to Full JPY
             pred_full = int(pred_thousands * 1000)
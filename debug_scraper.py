@@ -1,4 +1,4 @@
-from src.scraper import fetch_page
+from src.scraper import fetch_page, html_cache_requested
 import re
 
 #Target URL
@@ -7,7 +7,7 @@ url = "https://www.tc-v.com/used_car/honda/fit/"
 print("---DIAGNOSTIC RUN---")
 
 #Fetch the raw HTML
-html = fetch_page(url)
+html = fetch_page(url, use_cache=html_cache_requested())
 
 if html:
 
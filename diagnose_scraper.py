@@ -1,4 +1,4 @@
-from src.scraper import fetch_page, parse_search_results
+from src.scraper import fetch_page, html_cache_requested, parse_search_results
 import re
 
 # The Problematic URL
@@ -8,7 +8,7 @@ print(f"--- DIAGNOSING: {target_url} ---")
 
 # 1. Fetch raw HTML
 print("1. Fetching HTML...")
-html = fetch_page(target_url)
+html = fetch_page(target_url, use_cache=html_cache_requested())
 
 if not html:
     print("❌ FATAL: Could not fetch page. Likely Network/Firewall issue.")
@@ -24,9 +24,10 @@ print("   -> Saved raw HTML to 'debug_output.html'. Open this in Chrome to check
 # 3. Test Parsing
 print("2. Testing Parser...")
 cars = parse_search_results(html, target_mark="mazda", target_model="rx-7")
-print(f"✅ Found {len(cars)} valid cars in this page.")
+n_cars = len(cars['price'])
+print(f"✅ Found {n_cars} valid cars in this page.")
 
-if len(cars) == 0:
+if n_cars == 0:
     print("❌ WARNING: No cars passed the filter!")
     
     # Debug WHY they failed
@@ -40,11 +41,11 @@ if len(cars) == 0:
     prices = re.findall(r'US\$\s*([\d,]+)', html)
     print(f"   -> Found {len(prices)} price strings (e.g., {prices[:3] if prices else 'None'}).")
     
-    if len(prices) > 0 and len(cars) == 0:
+    if len(prices) > 0 and n_cars == 0:
         print("   -> CONCLUSION: Prices exist, but the filtering logic (Year/Price>0) is dropping them.")
     elif len(prices) == 0:
         print("   -> CONCLUSION: No prices found. They might be 'ASK' or hidden via JavaScript.")
 
 else:
     print("   -> Success! The scraper logic is working.")
-    print(f"   -> Example: {cars[0]}")
\ No newline at end of file
+    print(f"   -> Example: { {col: values[0] for col, values in cars.items()} }")
\ No newline at end of file
@@ -36,7 +36,7 @@ def main():
     df_cleaned = clean_price_data(df)
 
     #filtrowanie
-    df_target = filter_target_car(df, TARGET_MARK, TARGET_MODEL)
+    df_target = filter_target_car(df_cleaned, TARGET_MARK, TARGET_MODEL)
 
     #Sprawdzanie czy po filtrowaniu coś zostalo
     if df_target.empty:
@@ -10,7 +10,8 @@ def get_user_selection(df):
 
     #Getting available marks
     available_marks = df['mark'].value_counts()
-    unique_marks = available_marks.index.tolist()
+    # Index lookups are hash-based; no need to materialise a Python list
+    unique_marks = available_marks.index
 
     #Display TOP5
     print("Most popular marks:")
@@ -23,7 +24,7 @@ def get_user_selection(df):
         user_input = input("\nEnter mark: ").lower().strip()
 
         if user_input == "ALL":
-            print("\nAll marks: ", unique_marks)
+            print("\nAll marks: ", unique_marks.tolist())
             continue
 
         if user_input in unique_marks:
@@ -38,7 +39,7 @@ def get_user_selection(df):
     #Filter df to find models for this specific mark
     mark_mask = df['mark'] == selected_mark
     available_models = df[mark_mask]['model'].value_counts()
-    unique_models = available_models.index.tolist()
+    unique_models = available_models.index
 
     #Display TOP5 models
     print(f"Most popular {selected_mark.title()} models")
@@ -51,7 +52,7 @@ def get_user_selection(df):
         user_input = input("\nEnter model: ").lower().strip()
 
         if user_input == "all":
-            print(f"\nALL {selected_mark.upper()} MODELS: ", unique_models)
+            print(f"\nALL {selected_mark.upper()} MODELS: ", unique_models.tolist())
             continue
         
         if user_input in unique_models:
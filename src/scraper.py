@@ -1,15 +1,245 @@
 import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
+import atexit
+from bs4 import BeautifulSoup, SoupStrainer
+import gzip
+import hashlib
+import json
+import logging
+import numpy as np
+import os
+import queue
 import re
 import sys
+import tempfile
+import threading
 import time
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
+logger = logging.getLogger(__name__)
+
 # --- [WINDOWS FIX] ---
 if sys.platform.startswith('win'):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
+# --- [HTTP SESSION] ---
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Referer': 'https://www.google.com/'
+}
+
+MAX_CONCURRENT_REQUESTS = 10
+REQUEST_INTERVAL = 0.1  # Polite delay: minimum gap between request starts (s)
+PARSE_WORKERS = 4
+LOG_HISTORY = 200  # UI log lines kept per scrape; older ones roll off
+FAILED_PAGES_SHOWN = 20  # Page numbers listed in the UI failure summary
+
+PAGE_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10, sock_read=20)
+RATE_API_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+def make_session():
+    """
+    Creates a pooled session: one keep-alive connection per concurrent slot,
+    reused for every page so TCP/TLS handshakes are paid only once.
+    DNS answers are cached so pages don't re-resolve the host.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=2 * MAX_CONCURRENT_REQUESTS,
+        limit_per_host=MAX_CONCURRENT_REQUESTS,
+        keepalive_timeout=60,
+        ttl_dns_cache=600
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=PAGE_TIMEOUT, headers=DEFAULT_HEADERS)
+
+# One loop and one session for the life of the process, so repeated scrapes
+# reuse warm keep-alive connections instead of re-handshaking every call.
+# The loop runs in a daemon thread; concurrent callers' scrapes interleave on it.
+_LOOP = None
+_SESSION = None
+_LOOP_LOCK = threading.Lock()  # Guards loop creation only
+
+async def _get_session():
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = make_session()
+    return _SESSION
+
+def _get_loop():
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, name='scraper-loop', daemon=True).start()
+    return _LOOP
+
+def _submit(coro):
+    """Schedules a coroutine on the background loop; returns a concurrent Future."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+@atexit.register
+def _close_session():
+    if _LOOP is None:
+        return
+    if _SESSION is not None and not _SESSION.closed:
+        try:
+            _submit(_SESSION.close()).result(timeout=5)
+        except Exception:
+            pass
+    _LOOP.call_soon_threadsafe(_LOOP.stop)
+
+class RateLimiter:
+    """
+    Spaces request starts at least `min_interval` apart across all workers.
+    Unlike a sleep inside each semaphore slot, waiting here does not cap
+    throughput at slots / (delay + RTT).
+    """
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = asyncio.Lock()
+        self._last_start = 0.0
+
+    async def wait(self):
+        async with self._lock:
+            delay = self._last_start + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._last_start = time.monotonic()
+
+# --- [HTML CACHE] ---
+
+# Opt-in: re-runs during model iteration hit the same URLs; keep pages on disk.
+# Entry points enable it with JDM_HTML_CACHE=1 (see html_cache_requested).
+HTML_CACHE_ENV_VAR = "JDM_HTML_CACHE"
+HTML_CACHE_DIR = Path("data") / "cache" / "html"
+HTML_CACHE_TTL = 3600  # Served without a request while younger than this (s)
+HTML_CACHE_MAX_AGE = 7 * 24 * 3600  # Entries untouched for longer are deleted (s)
+
+def html_cache_requested():
+    """True when the environment opts in to the on-disk page cache."""
+    return os.environ.get(HTML_CACHE_ENV_VAR, '').strip().lower() in ('1', 'true', 'yes')
+
+def _cache_paths(url):
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    folder = HTML_CACHE_DIR / digest[:2]
+    return folder / f"{digest}.html.gz", folder / f"{digest}.json"
+
+def read_cached_page(url):
+    """
+    Returns (html, validators, fresh) for a cached page, or (None, {}, False).
+    `validators` holds the conditional headers for revalidating a stale copy.
+    """
+    page_path, meta_path = _cache_paths(url)
+    try:
+        age = time.time() - page_path.stat().st_mtime
+        with gzip.open(page_path, 'rt', encoding='utf-8') as f:
+            html = f.read()
+        meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+    except (OSError, ValueError):
+        return None, {}, False
+    
+    validators = {}
+    if meta.get('etag'): validators['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'): validators['If-Modified-Since'] = meta['last_modified']
+    return html, validators, age < HTML_CACHE_TTL
+
+def write_cached_page(url, html, headers):
+    """Stores a page gzip-compressed, with its ETag/Last-Modified alongside."""
+    page_path, meta_path = _cache_paths(url)
+    tmp_name = None
+    try:
+        page_path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name: concurrent writers of the same page must not collide
+        with tempfile.NamedTemporaryFile(dir=page_path.parent, suffix='.tmp', delete=False) as tmp:
+            tmp_name = tmp.name
+            with gzip.open(tmp, 'wt', encoding='utf-8', compresslevel=6) as f:
+                f.write(html)
+        os.replace(tmp_name, page_path)
+        tmp_name = None
+        meta_path.write_text(json.dumps({
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified')
+        }))
+    except OSError:
+        pass  # The cache is an optimisation; never fail a scrape over it
+    finally:
+        if tmp_name:
+            Path(tmp_name).unlink(missing_ok=True)
+
+def touch_cached_page(url):
+    """Marks a revalidated (304) page as fresh again."""
+    try:
+        os.utime(_cache_paths(url)[0])
+    except OSError:
+        pass
+
+def prune_html_cache(max_age=HTML_CACHE_MAX_AGE):
+    """Deletes cached pages (and their sidecars) older than `max_age` seconds."""
+    cutoff = time.time() - max_age
+    removed = 0
+    for page_path in HTML_CACHE_DIR.glob('*/*.html.gz'):
+        try:
+            if page_path.stat().st_mtime < cutoff:
+                page_path.unlink()
+                page_path.with_name(page_path.name.replace('.html.gz', '.json')).unlink(missing_ok=True)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+# --- [PARSING PATTERNS] ---
+
+# Compiled once at import; the per-container loop only dispatches .search()
+CAR_ITEM_CLASS = re.compile(r'car-item')
+LISTING_CLASS = re.compile(r'(product|item|listing)')
+PRICE_CLASS = re.compile(r'(price|fob)', re.IGNORECASE)
+GRADE_CLASS = re.compile(r'grade')
+
+NON_DIGIT_PATTERN = re.compile(r'[^\d]')
+USD_PRICE_PATTERN = re.compile(r'US\$\s*([\d,]+)')  # Case-sensitive, on the original text
+# Searched on its own: a year may sit inside a mileage ('2005 km') or a price
+YEAR_PATTERN = re.compile(r'\b(198\d|199\d|200\d|201\d|202\d)\b')  # Expanded Year Regex (1980s+)
+
+# The remaining specs, recognised in a single left-to-right scan. Mileage and
+# engine numbers each end in their own unit, so neither can hide the other.
+# Matched against upper-cased text, so no case-folding in the engine.
+LISTING_FIELDS_PATTERN = re.compile(
+    r'(?P<km>[\d,]+\s*KM)'
+    r'|(?P<cc>[\d,]+\s*CC)'
+    r'|(?P<mt>\b(?:MT|MANUAL|F5|F6|5MT|6MT)\b)'
+    r'|(?P<awd>\b(?:4WD|AWD)\b)'
+)
+
+# Only listing cards (and the fallback product/listing blocks) are built into
+# the tree; headers, scripts and navigation are skipped by the tokenizer.
+LISTING_STRAINER = SoupStrainer(['li', 'div'], class_=re.compile(r'(car-item|product|item|listing)'))
+
+# --- [LISTING SCHEMA] ---
+
+LISTING_COLUMNS = ('price', 'year', 'mileage', 'engine_capacity', 'transmission',
+                   'drive', 'grade', 'mark', 'model', 'link')
+
+# Known widths for the numeric columns ('000 JPY, calendar year, km, cc)
+LISTING_DTYPES = {'price': 'int32', 'year': 'int16', 'mileage': 'int32', 'engine_capacity': 'int32'}
+# Parsed numbers above this are junk and would overflow the int32 columns
+# (years are bounded by YEAR_PATTERN, so they always fit int16)
+LISTING_INT_MAX = int(np.iinfo(np.int32).max)
+
+def empty_listings():
+    """
+    Columnar container for scraped cars: one list per field (struct-of-arrays),
+    so the DataFrame is built once without per-row dict inference.
+    """
+    return {col: [] for col in LISTING_COLUMNS}
+
+def extend_listings(target, source):
+    for col in LISTING_COLUMNS:
+        target[col].extend(source[col])
+
 # --- [CORE ASYNC ENGINE] ---
 
 async def get_usd_jpy_rate_async(session, logs):
@@ -18,7 +248,7 @@ async def get_usd_jpy_rate_async(session, logs):
     """
     url = "https://open.er-api.com/v6/latest/USD"
     try:
-        async with session.get(url, timeout=5) as response:
+        async with session.get(url, timeout=RATE_API_TIMEOUT) as response:
             if response.status == 200:
                 data = await response.json()
                 rate = data['rates']['JPY']
@@ -29,57 +259,81 @@ async def get_usd_jpy_rate_async(session, logs):
     
     return 150.0
 
-async def fetch_page_async(session, url, semaphore, logs):
+async def fetch_page_async(session, url, semaphore, *, limiter=None, use_cache=False, logs=None):
     """
-    Fetches a single page. Handles 404s gracefully (End of Pagination).
+    Fetches a single page. Handles 404s gracefully (End of Pagination):
+    returns '' for a 404 and None for any other failure.
+    With `use_cache`, fresh pages come from the on-disk cache and stale ones
+    are revalidated. Cache file I/O runs in worker threads.
+    Failures always go to the module logger; pass `logs` to also surface
+    them in the UI log (used for the page-1 probe).
     """
+    cached_html, validators = None, {}
+    if use_cache:
+        cached_html, validators, fresh = await asyncio.to_thread(read_cached_page, url)
+        if fresh:
+            logger.debug("Cache hit %s", url)
+            return cached_html
+    
     async with semaphore:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-            'Referer': 'https://www.google.com/'
-        }
         try:
-            await asyncio.sleep(0.5) # Polite delay
-            async with session.get(url, headers=headers, timeout=30) as response:
+            if limiter: await limiter.wait()
+            async with session.get(url, headers=validators) as response:
                 if response.status == 200:
-                    return await response.text()
+                    html = await response.text()
+                    if use_cache:
+                        # Header lookup is case-insensitive only on the response itself
+                        headers = {key: response.headers.get(key) for key in ('ETag', 'Last-Modified')}
+                        await asyncio.to_thread(write_cached_page, url, html, headers)
+                    return html
+                elif response.status == 304 and cached_html is not None:
+                    await asyncio.to_thread(touch_cached_page, url)
+                    return cached_html
                 elif response.status == 404:
                     # 404 is expected when we reach the end of listings
-                    return None
+                    if logs is not None: logs.append(f"❌ [Network] Error 404 at {url}")
+                    return ''
                 else:
-                    logs.append(f"❌ [Network] Error {response.status} at {url}")
+                    # Per-page errors go to the logger: formatted only if emitted
+                    logger.warning("Network error %d at %s", response.status, url)
+                    if logs is not None: logs.append(f"❌ [Network] Error {response.status} at {url}")
                     return None
         except Exception as e:
-            # logs.append(f"❌ [Network] Exception: {e}")
+            logger.warning("Network exception at %s: %r", url, e)
+            if logs is not None: logs.append(f"❌ [Network] Exception at {url}: {type(e).__name__} {e}")
             return None
 
-def extract_price(container, text_content, exchange_rate):
-    price_usd = 0
-    
-    price_tag = container.find(['p', 'span', 'div'], class_=re.compile(r'(price|fob)', re.IGNORECASE))
+def extract_price_usd(container, text_content):
+    """
+    Price in USD: the tagged price/FOB element wins, otherwise the
+    first 'US$ ...' amount found in the card text.
+    """
+    price_tag = container.find(['p', 'span', 'div'], class_=PRICE_CLASS)
     if price_tag:
-        digits = re.sub(r'[^\d]', '', price_tag.get_text(strip=True))
-        if digits: price_usd = int(digits)
+        digits = NON_DIGIT_PATTERN.sub('', price_tag.get_text(strip=True))
+        if digits and int(digits) > 0: return int(digits)
 
-    if price_usd == 0:
-        match = re.search(r'US\$\s*([\d,]+)', text_content)
-        if match:
-            price_usd = int(match.group(1).replace(',', ''))
+    match = USD_PRICE_PATTERN.search(text_content)
+    return int(match.group(1).replace(',', '')) if match else 0
 
-    if price_usd > 0:
-        return int((price_usd * exchange_rate) / 1000)
-    return 0
+def usd_to_jpy_thousands(prices_usd, exchange_rate):
+    """
+    Vectorised USD -> '000 JPY, truncated toward zero like int().
+    Prices too large for the int32 column come back as 0, i.e. dropped.
+    """
+    prices = np.asarray(prices_usd, dtype=np.float64) * exchange_rate / 1000
+    return np.where(prices <= LISTING_INT_MAX, prices, 0).astype(np.int64)
 
 def parse_search_results(html_text, exchange_rate, target_mark, target_model, logs):
-    if not html_text: return []
+    if not html_text: return empty_listings()
     
-    soup = BeautifulSoup(html_text, 'html.parser')
-    cars_data = []
+    # lxml: C tokenizer, markedly faster than the pure-Python html.parser
+    soup = BeautifulSoup(html_text, 'lxml', parse_only=LISTING_STRAINER)
+    cars_data = empty_listings()
     
-    containers = soup.find_all(['li', 'div'], class_=re.compile(r'car-item'))
+    containers = soup.find_all(['li', 'div'], class_=CAR_ITEM_CLASS)
     if not containers:
-        containers = soup.find_all('div', class_=re.compile(r'(product|item|listing)'))
+        containers = soup.find_all('div', class_=LISTING_CLASS)
 
     for container in containers:
         try:
@@ -88,33 +342,48 @@ def parse_search_results(html_text, exchange_rate, target_mark, target_model, lo
             car_link = link_tag['href'] if link_tag else None
             if car_link and not car_link.startswith('http'): car_link = f"https://www.tc-v.com{car_link}"
 
-            price = extract_price(container, full_text, exchange_rate)
-            
-            # Expanded Year Regex (1980s+)
-            year_match = re.search(r'\b(198\d|199\d|200\d|201\d|202\d)\b', full_text)
-            year = int(year_match.group(0)) if year_match else None
+            # First occurrence of each spec wins
+            fields = {}
+            for match in LISTING_FIELDS_PATTERN.finditer(full_text.upper()):
+                fields.setdefault(match.lastgroup, match.group())
 
-            mile_match = re.search(r'([\d,]+)\s*km', full_text, re.IGNORECASE)
-            mileage = int(mile_match.group(1).replace(',', '')) if mile_match else 0
+            price_usd = extract_price_usd(container, full_text)
             
-            eng_match = re.search(r'([\d,]+)\s*cc', full_text, re.IGNORECASE)
-            engine = int(eng_match.group(1).replace(',', '')) if eng_match else 0
+            year_match = YEAR_PATTERN.search(full_text)
+            year = int(year_match.group(0)) if year_match else None
+            mileage = int(NON_DIGIT_PATTERN.sub('', fields['km'])) if 'km' in fields else 0
+            engine = int(NON_DIGIT_PATTERN.sub('', fields['cc'])) if 'cc' in fields else 0
 
-            is_mt = bool(re.search(r'\b(MT|Manual|F5|F6|5MT|6MT)\b', full_text, re.IGNORECASE))
-            is_4wd = bool(re.search(r'\b(4WD|AWD)\b', full_text, re.IGNORECASE))
+            is_mt = 'mt' in fields
+            is_4wd = 'awd' in fields
             
-            grade_tag = container.find('p', class_=re.compile(r'grade'))
+            grade_tag = container.find('p', class_=GRADE_CLASS)
             grade = grade_tag.get_text(strip=True) if grade_tag else "Unknown"
 
-            if price > 0 and year:
-                cars_data.append({
-                    'price': price, 'year': year, 'mileage': mileage, 'engine_capacity': engine,
-                    'transmission': 'mt' if is_mt else 'at', 'drive': '4wd' if is_4wd else '2wd',
-                    'grade': grade, 'mark': target_mark, 'model': target_model, 'link': car_link
-                })
+            if 0 < price_usd <= LISTING_INT_MAX and year and mileage <= LISTING_INT_MAX and engine <= LISTING_INT_MAX:
+                cars_data['price'].append(price_usd)
+                cars_data['year'].append(year)
+                cars_data['mileage'].append(mileage)
+                cars_data['engine_capacity'].append(engine)
+                cars_data['transmission'].append('mt' if is_mt else 'at')
+                cars_data['drive'].append('4wd' if is_4wd else '2wd')
+                cars_data['grade'].append(grade)
+                cars_data['mark'].append(target_mark)
+                cars_data['model'].append(target_model)
+                cars_data['link'].append(car_link)
         except Exception:
             continue
 
+    # One array op for the whole page instead of float math per card
+    prices = usd_to_jpy_thousands(cars_data['price'], exchange_rate)
+    keep = prices > 0
+    cars_data['price'] = prices.tolist()
+    if not keep.all():
+        # Sub-1000 JPY listings are noise, as before
+        keep = keep.tolist()
+        for col in LISTING_COLUMNS:
+            cars_data[col] = [v for v, k in zip(cars_data[col], keep) if k]
+
     return cars_data
 
 # --- https://learn.microsoft.com/en-us/azure/logic-apps/error-exception-handling ---
@@ -122,7 +391,8 @@ def parse_search_results(html_text, exchange_rate, target_mark, target_model, lo
 def get_clean_base_url(url):
     """
     Removes the 'pn' parameter from the URL to get the true Page 1 URL.
-    Preserves other filters (e.g., ?steering=rhd).
+    Preserves other filters (e.g., ?steering=rhd). The fragment is dropped
+    (never sent to the server) so page numbers can be appended directly.
     """
     parsed = urlparse(url)
     query_params = parse_qs(parsed.query)
@@ -139,92 +409,136 @@ def get_clean_base_url(url):
         parsed.path,
         parsed.params,
         new_query,
-        parsed.fragment
+        ''
     ))
     return new_url
 
-def build_pagination_url(base_url, page_number):
-    """
-    Safely adds 'pn=X' to the URL.
-    """
-    parsed = urlparse(base_url)
-    query_params = parse_qs(parsed.query)
+async def scrape_listings_async_runner(base_url, max_pages, progress_callback, target_mark, target_model, use_cache=False):
+    logs = deque(maxlen=LOG_HISTORY)
+    all_cars = empty_listings()
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    limiter = RateLimiter(REQUEST_INTERVAL)
     
-    query_params['pn'] = [str(page_number)]
+    logs.append(f"🚀 [System] Target URL: {base_url}")
     
-    new_query = urlencode(query_params, doseq=True)
+    session = await _get_session()
     
-    new_url = urlunparse((
-        parsed.scheme,
-        parsed.netloc,
-        parsed.path,
-        parsed.params,
-        new_query,
-        parsed.fragment
-    ))
-    return new_url
+    if use_cache:
+        pruned = await asyncio.to_thread(prune_html_cache)
+        logs.append(f"💾 [Cache] Reusing pages cached within {HTML_CACHE_TTL}s. Pruned {pruned} old pages.")
 
-async def scrape_listings_async_runner(base_url, max_pages, progress_callback, target_mark, target_model):
-    logs = []
-    all_cars = []
-    sem = asyncio.Semaphore(5)
+    # --- PHASE 1: PAGE 1 (THE ROOT) ---
+    # We use the cleaned base URL directly. We DO NOT append pn=1.
+    page1_url = get_clean_base_url(base_url)
+    logs.append(f"🔎 [System] Fetching Page 1: {page1_url}")
     
-    logs.append(f"🚀 [System] Target URL: {base_url}")
+    # The exchange rate and the probe page are independent: overlap them
+    rate, probe_html = await asyncio.gather(
+        get_usd_jpy_rate_async(session, logs),
+        fetch_page_async(session, page1_url, sem, limiter=limiter, use_cache=use_cache, logs=logs)
+    )
     
-    async with aiohttp.ClientSession() as session:
-        rate = await get_usd_jpy_rate_async(session, logs)
+    if not probe_html:
+        logs.append("❌ [Critical] Page 1 failed. Check URL or Network.")
+        return all_cars, list(logs)
         
-        # --- PHASE 1: PAGE 1 (THE ROOT) ---
-        # We use the cleaned base URL directly. We DO NOT append pn=1.
-        page1_url = get_clean_base_url(base_url)
-        logs.append(f"🔎 [System] Fetching Page 1: {page1_url}")
+    # Off the loop, so other callers' scrapes keep moving while this parses
+    cars_p1 = await asyncio.get_running_loop().run_in_executor(
+        None, parse_search_results, probe_html, rate, target_mark, target_model, logs
+    )
+    extend_listings(all_cars, cars_p1)
+    if progress_callback: progress_callback(1, max_pages)
+    
+    if not cars_p1['price']:
+         logs.append("⚠️ [Warning] Page 1 loaded but NO cars found. Check selectors.")
+
+    # --- PHASE 2: MASS SCRAPE (Pages 2 to N) ---
+    # Only proceed if we actually found cars on Page 1
+    if max_pages > 1 and len(cars_p1['price']) > 0:
+        completed_tasks = 1
         
-        probe_html = await fetch_page_async(session, page1_url, sem, logs)
+        async def monitored_fetch(page, url):
+            nonlocal completed_tasks
+            html = await fetch_page_async(session, url, sem, limiter=limiter, use_cache=use_cache)
+            completed_tasks += 1
+            if progress_callback: progress_callback(completed_tasks, max_pages)
+            return page, html
+
+        # Only 'pn' changes between pages: format it in instead of re-parsing the URL
+        sep = '&' if '?' in page1_url else '?'
+        url_template = f"{page1_url}{sep}pn={{}}"
         
-        if not probe_html:
-            logs.append("❌ [Critical] Page 1 failed. Check URL or Network.")
-            return [], logs
-            
-        cars_p1 = parse_search_results(probe_html, rate, target_mark, target_model, logs)
-        all_cars.extend(cars_p1)
-        if progress_callback: progress_callback(1, max_pages)
+        tasks = []
+        for i in range(2, max_pages + 1):
+            tasks.append(asyncio.create_task(monitored_fetch(i, url_template.format(i))))
         
-        if not cars_p1:
-             logs.append("⚠️ [Warning] Page 1 loaded but NO cars found. Check selectors.")
-
-        # --- PHASE 2: MASS SCRAPE (Pages 2 to N) ---
-        # Only proceed if we actually found cars on Page 1
-        if max_pages > 1 and len(cars_p1) > 0:
-            completed_tasks = 1
-            
-            async def monitored_fetch(url):
-                nonlocal completed_tasks
-                html = await fetch_page_async(session, url, sem, logs)
-                completed_tasks += 1
-                if progress_callback: progress_callback(completed_tasks, max_pages)
-                return html
-
-            tasks = []
-            for i in range(2, max_pages + 1):
-                url = build_pagination_url(page1_url, i)
-                tasks.append(monitored_fetch(url))
-            
-            html_pages = await asyncio.gather(*tasks)
-            
-            valid_pages_count = 1 
-            for html in html_pages:
-                if html:
-                    valid_pages_count += 1
-                    cars = parse_search_results(html, rate, target_mark, target_model, logs)
-                    all_cars.extend(cars)
-            
-            logs.append(f"🏁 [System] Scrape Finished. Pages: {valid_pages_count}. Total Cars: {len(all_cars)}")
+        # Parse each page as soon as it lands, in worker threads, while the
+        # remaining fetches continue; raw HTML is released right after.
+        loop = asyncio.get_running_loop()
+        pages = {}
+        failed_pages = set()
+        last_page = max_pages
+        try:
+            pending = set(tasks)
+            with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+                while pending:
+                    # Unlike as_completed, this lets a cancellation of the runner itself propagate
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.cancelled():
+                            continue  # Cut off by the early stop below
+                        page, html = task.result()
+                        if page > last_page:
+                            continue
+                        if html is None:
+                            # Errored pages are skipped; they don't mark the end
+                            failed_pages.add(page)
+                            continue
+                    
+                        cars = None
+                        if html:
+                            cars = await loop.run_in_executor(
+                                executor, parse_search_results, html, rate, target_mark, target_model, logs
+                            )
+                    
+                        if not cars or not cars['price']:
+                            # 404 or an empty page: ran out of listings, so drop every request past it
+                            last_page = page - 1
+                            for later in tasks[page - 1:]:
+                                later.cancel()
+                            continue
+                        pages[page] = cars
+        finally:
+            # The loop outlives this call: never leave page fetches running
+            # (e.g. when a progress callback or a parse raises mid-scrape)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if last_page < max_pages:
+            logs.append(f"⏹️ [System] No listings after page {last_page}. Skipped {max_pages - last_page} requests.")
+            if progress_callback: progress_callback(max_pages, max_pages)
+        
+        # Details went to the logger; the UI gets a bounded summary
+        failed_pages = sorted(page for page in failed_pages if page <= last_page)
+        if failed_pages:
+            shown = ', '.join(map(str, failed_pages[:FAILED_PAGES_SHOWN]))
+            more = f" (+{len(failed_pages) - FAILED_PAGES_SHOWN} more)" if len(failed_pages) > FAILED_PAGES_SHOWN else ""
+            logs.append(f"⚠️ [Network] Skipped {len(failed_pages)} page(s) after errors: {shown}{more}")
+        
+        # Merge in page order so the dataset doesn't depend on network timing
+        pages = {page: cars for page, cars in pages.items() if page <= last_page}
+        valid_pages_count = 1 + len(pages)
+        for page in sorted(pages):
+            extend_listings(all_cars, pages[page])
+        
+        logs.append(f"🏁 [System] Scrape Finished. Pages: {valid_pages_count}. Total Cars: {len(all_cars['price'])}")
 
-    return all_cars, logs
+    return all_cars, list(logs)
 
 # --- [SYNCHRONOUS API] ---
 
-def scrape_listings(base_url, max_pages=100, progress_callback=None):
+def scrape_listings(base_url, max_pages=100, progress_callback=None, use_cache=False):
     try:
         parts = base_url.strip('/').split('/')
         if 'used_car' in parts:
@@ -239,14 +553,26 @@ def scrape_listings(base_url, max_pages=100, progress_callback=None):
     if sys.platform.startswith('win'):
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-    return asyncio.run(scrape_listings_async_runner(base_url, max_pages, progress_callback, t_mark, t_model))
+    # The scrape runs on the background loop; progress is relayed back so the
+    # callback runs in this thread (Streamlit elements need the script's context)
+    updates = queue.SimpleQueue()
+    report = (lambda done, total: updates.put((done, total))) if progress_callback else None
+    future = _submit(scrape_listings_async_runner(base_url, max_pages, report, t_mark, t_model, use_cache))
+    future.add_done_callback(lambda _: updates.put(None))
+    try:
+        for done, total in iter(updates.get, None):
+            progress_callback(done, total)
+    except BaseException:
+        future.cancel()
+        raise
+    return future.result()
 
-def fetch_page(url):
+def fetch_page(url, use_cache=False):
     """Sync wrapper for debugging"""
     if sys.platform.startswith('win'):
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
     
-    async def _run():
-        async with aiohttp.ClientSession() as session:
-            return await fetch_page_async(session, url, asyncio.Semaphore(1), [])
-    return asyncio.run(_run())
\ No newline at end of file
+    async def _fetch():
+        session = await _get_session()
+        return await fetch_page_async(session, url, asyncio.Semaphore(1), use_cache=use_cache)
+    return _submit(_fetch()).result()
\ No newline at end of file
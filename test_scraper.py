@@ -1,16 +1,24 @@
-from src.scraper import fetch_page, parse_search_results
+from src.scraper import fetch_page, html_cache_requested, parse_search_results
+
+#Offline regression: a mileage that reads like a year ("2005 km") must not
+#hide the year from the parser; the car is kept with year 2005
+sample = '<div class="car-item"><p>US$ 2,010 2005 km 1300cc</p></div>'
+sample_data = parse_search_results(sample, 150.0, "honda", "fit", [])
+assert sample_data['year'] == [2005], sample_data
+assert sample_data['mileage'] == [2005] and sample_data['engine_capacity'] == [1300], sample_data
+print("✅ Offline parse regression passed.")
 
 #Target
 target_url = "https://www.tc-v.com/used_car/honda/fit/"
 
-html = fetch_page(target_url)
+html = fetch_page(target_url, use_cache=html_cache_requested())
 
 if html:
-    data= parse_search_results(html)
+    data= parse_search_results(html, 150.0, "honda", "fit", [])
 
     print(f"\nExtracted Data (first 3 cars):")
-    for car in data[:3]:
-        print(car)
+    for i in range(min(3, len(data['price']))):
+        print({col: values[i] for col, values in data.items()})
     #Print the first 500 characters to prove
     print(html[:500])
 else: